@@ -9,6 +9,7 @@ from typing import (
     Optional,
     Tuple,
     TypeVar,
+    Union,
     cast,
 )
 
@@ -40,6 +41,8 @@ from ...metrics import EvaluatorProtocol, evaluate_qlearning_with_environment
 from ...models.torch import Policy
 from ...torch_utility import (
     TorchMiniBatch,
+    convert_metrics_list_to_float,
+    convert_metrics_to_float,
     convert_to_torch,
     convert_to_torch_recursively,
     eval_api,
@@ -65,13 +68,15 @@ __all__ = [
 
 class QLearningAlgoImplBase(ImplBase):
     @train_api
-    def update(self, batch: TorchMiniBatch, grad_step: int) -> Dict[str, float]:
+    def update(
+        self, batch: TorchMiniBatch, grad_step: int
+    ) -> Dict[str, Union[float, torch.Tensor]]:
         return self.inner_update(batch, grad_step)
 
     @abstractmethod
     def inner_update(
         self, batch: TorchMiniBatch, grad_step: int
-    ) -> Dict[str, float]:
+    ) -> Dict[str, Union[float, torch.Tensor]]:
         pass
 
     @eval_api
@@ -449,6 +454,12 @@ class QLearningAlgoBase(
                 my_plot(metrics)
                 algo.save_model(my_path)
 
+        Losses are kept on device and transferred every 10 iterations to
+        avoid a device synchronization at every step. Because CUDA kernels
+        run asynchronously, ``time_algorithm_update`` measures how long it
+        takes to launch the update. Waiting for the device to finish is
+        recorded as ``time_sync_metrics`` when losses are transferred.
+
         Args:
             dataset: Offline dataset to train.
             n_steps: Number of steps to train.
@@ -511,6 +522,9 @@ class QLearningAlgoBase(
             # dict to add incremental mean losses to epoch
             epoch_loss = defaultdict(list)
 
+            # metrics are kept on device until they are recorded
+            pending_losses: List[Dict[str, Union[float, torch.Tensor]]] = []
+
             range_gen = tqdm(
                 range(n_steps_per_epoch),
                 disable=not show_progress,
@@ -527,15 +541,20 @@ class QLearningAlgoBase(
 
                     # update parameters
                     with logger.measure_time("algorithm_update"):
-                        loss = self.update(batch)
-
-                    # record metrics
-                    for name, val in loss.items():
-                        logger.add_metric(name, val)
-                        epoch_loss[name].append(val)
-
-                    # update progress postfix with losses
-                    if itr % 10 == 0:
+                        pending_losses.append(self._update_on_device(batch))
+
+                    # record metrics and update progress postfix with losses
+                    if itr % 10 == 0 or itr == n_steps_per_epoch - 1:
+                        # device is synchronized only once for pending losses
+                        with logger.measure_time("sync_metrics"):
+                            losses = convert_metrics_list_to_float(
+                                pending_losses
+                            )
+                        for loss in losses:
+                            for name, val in loss.items():
+                                logger.add_metric(name, val)
+                                epoch_loss[name].append(val)
+                        pending_losses.clear()
                         mean_loss = {
                             k: np.mean(v) for k, v in epoch_loss.items()
                         }
@@ -820,6 +839,11 @@ class QLearningAlgoBase(
         Returns:
             Dictionary of metrics.
         """
+        return convert_metrics_to_float(self._update_on_device(batch))
+
+    def _update_on_device(
+        self, batch: TransitionMiniBatch
+    ) -> Dict[str, Union[float, torch.Tensor]]:
         assert self._impl, IMPL_NOT_INITIALIZED_ERROR
         torch_batch = TorchMiniBatch.from_batch(
             batch=batch,
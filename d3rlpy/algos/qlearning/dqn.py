@@ -44,6 +44,14 @@ class DQNConfig(LearnableConfig):
         gamma (float): Discount factor.
         n_critics (int): Number of Q functions for ensemble.
         target_update_interval (int): Interval to update the target network.
+        accumulation_steps (int): Number of mini-batches to accumulate
+            gradients over before each optimizer step.
+        use_cuda_graph (bool): Flag to capture the update step with CUDA
+            Graphs after a few warmup steps. This requires a CUDA device and
+            a fixed mini-batch shape, and cannot be combined with
+            ``use_amp``.
+        use_amp (bool): Flag to run Q function forwards in bfloat16 with
+            ``torch.autocast``. Losses are still computed in float32.
     """
     batch_size: int = 32
     learning_rate: float = 6.25e-5
@@ -53,6 +61,9 @@ class DQNConfig(LearnableConfig):
     gamma: float = 0.99
     n_critics: int = 1
     target_update_interval: int = 8000
+    accumulation_steps: int = 1
+    use_cuda_graph: bool = False
+    use_amp: bool = False
 
     def create(self, device: DeviceArg = False) -> "DQN":
         return DQN(self, device)
@@ -102,6 +113,9 @@ class DQN(QLearningAlgoBase[DQNImpl, DQNConfig]):
             modules=modules,
             gamma=self._config.gamma,
             device=self._device,
+            accumulation_steps=self._config.accumulation_steps,
+            use_cuda_graph=self._config.use_cuda_graph,
+            use_amp=self._config.use_amp,
         )
 
     def get_action_type(self) -> ActionSpace:
@@ -146,6 +160,14 @@ class DoubleDQNConfig(DQNConfig):
         n_critics (int): Number of Q functions.
         target_update_interval (int): Interval to synchronize the target
             network.
+        accumulation_steps (int): Number of mini-batches to accumulate
+            gradients over before each optimizer step.
+        use_cuda_graph (bool): Flag to capture the update step with CUDA
+            Graphs after a few warmup steps. This requires a CUDA device and
+            a fixed mini-batch shape, and cannot be combined with
+            ``use_amp``.
+        use_amp (bool): Flag to run Q function forwards in bfloat16 with
+            ``torch.autocast``. Losses are still computed in float32.
     """
     batch_size: int = 32
     learning_rate: float = 6.25e-5
@@ -155,6 +177,9 @@ class DoubleDQNConfig(DQNConfig):
     gamma: float = 0.99
     n_critics: int = 1
     target_update_interval: int = 8000
+    accumulation_steps: int = 1
+    use_cuda_graph: bool = False
+    use_amp: bool = False
 
     def create(self, device: DeviceArg = False) -> "DoubleDQN":
         return DoubleDQN(self, device)
@@ -204,6 +229,9 @@ class DoubleDQN(DQN):
             target_update_interval=self._config.target_update_interval,
             gamma=self._config.gamma,
             device=self._device,
+            accumulation_steps=self._config.accumulation_steps,
+            use_cuda_graph=self._config.use_cuda_graph,
+            use_amp=self._config.use_amp,
         )
 
 
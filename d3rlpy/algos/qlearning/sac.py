@@ -94,6 +94,10 @@ class SACConfig(LearnableConfig):
         tau (float): Target network synchronization coefficiency.
         n_critics (int): Number of Q functions for ensemble.
         initial_temperature (float): Initial temperature value.
+        compile_target_math (bool): Flag to compile the elementwise target
+            computation with ``torch.compile``.
+        use_amp (bool): Flag to run Q function forwards in bfloat16 with
+            ``torch.autocast``. Losses are still computed in float32.
     """
     actor_learning_rate: float = 3e-4
     critic_learning_rate: float = 3e-4
@@ -109,6 +113,8 @@ class SACConfig(LearnableConfig):
     tau: float = 0.005
     n_critics: int = 2
     initial_temperature: float = 1.0
+    compile_target_math: bool = False
+    use_amp: bool = False
 
     def create(self, device: DeviceArg = False) -> "SAC":
         return SAC(self, device)
@@ -182,6 +188,8 @@ class SAC(QLearningAlgoBase[SACImpl, SACConfig]):
             gamma=self._config.gamma,
             tau=self._config.tau,
             device=self._device,
+            compile_target_math=self._config.compile_target_math,
+            use_amp=self._config.use_amp,
         )
 
     def get_action_type(self) -> ActionSpace:
@@ -242,6 +250,14 @@ class DiscreteSACConfig(LearnableConfig):
         gamma (float): Discount factor.
         n_critics (int): Number of Q functions for ensemble.
         initial_temperature (float): Initial temperature value.
+        target_update_interval (int): Interval to synchronize the target
+            network.
+        accumulation_steps (int): Number of mini-batches to accumulate
+            critic gradients over before each optimizer step.
+        compile_target_math (bool): Flag to compile the elementwise target
+            computation with ``torch.compile``.
+        use_amp (bool): Flag to run Q function forwards in bfloat16 with
+            ``torch.autocast``. Losses are still computed in float32.
     """
     actor_learning_rate: float = 3e-4
     critic_learning_rate: float = 3e-4
@@ -257,6 +273,9 @@ class DiscreteSACConfig(LearnableConfig):
     n_critics: int = 2
     initial_temperature: float = 1.0
     target_update_interval: int = 8000
+    accumulation_steps: int = 1
+    compile_target_math: bool = False
+    use_amp: bool = False
 
     def create(self, device: DeviceArg = False) -> "DiscreteSAC":
         return DiscreteSAC(self, device)
@@ -330,6 +349,9 @@ class DiscreteSAC(QLearningAlgoBase[DiscreteSACImpl, DiscreteSACConfig]):
             target_update_interval=self._config.target_update_interval,
             gamma=self._config.gamma,
             device=self._device,
+            accumulation_steps=self._config.accumulation_steps,
+            compile_target_math=self._config.compile_target_math,
+            use_amp=self._config.use_amp,
         )
 
     def get_action_type(self) -> ActionSpace:
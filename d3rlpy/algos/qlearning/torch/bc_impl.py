@@ -43,7 +43,7 @@ class BCBaseImpl(QLearningAlgoImplBase, metaclass=ABCMeta):
             device=device,
         )
 
-    def update_imitator(self, batch: TorchMiniBatch) -> float:
+    def update_imitator(self, batch: TorchMiniBatch) -> torch.Tensor:
         self._modules.optim.zero_grad()
 
         loss = self.compute_loss(batch.observations, batch.actions)
@@ -51,7 +51,7 @@ class BCBaseImpl(QLearningAlgoImplBase, metaclass=ABCMeta):
         loss.backward()
         self._modules.optim.step()
 
-        return float(loss.cpu().detach().numpy())
+        return loss.detach()
 
     @abstractmethod
     def compute_loss(
@@ -69,7 +69,7 @@ class BCBaseImpl(QLearningAlgoImplBase, metaclass=ABCMeta):
 
     def inner_update(
         self, batch: TorchMiniBatch, grad_step: int
-    ) -> Dict[str, float]:
+    ) -> Dict[str, Union[float, torch.Tensor]]:
         return {"loss": self.update_imitator(batch)}
 
 
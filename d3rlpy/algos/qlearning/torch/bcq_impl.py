@@ -1,6 +1,6 @@
 import dataclasses
 import math
-from typing import Dict, cast
+from typing import Dict, Union, cast
 
 import torch
 import torch.nn.functional as F
@@ -97,7 +97,7 @@ class BCQImpl(DDPGBaseImpl):
         )
         return -value[0].mean()
 
-    def update_imitator(self, batch: TorchMiniBatch) -> Dict[str, float]:
+    def update_imitator(self, batch: TorchMiniBatch) -> Dict[str, torch.Tensor]:
         self._modules.imitator_optim.zero_grad()
 
         loss = compute_vae_error(
@@ -110,7 +110,7 @@ class BCQImpl(DDPGBaseImpl):
         loss.backward()
         self._modules.imitator_optim.step()
 
-        return {"imitator_loss": float(loss.cpu().detach().numpy())}
+        return {"imitator_loss": loss.detach()}
 
     def _repeat_observation(self, x: torch.Tensor) -> torch.Tensor:
         # (batch_size, *obs_shape) -> (batch_size, n, *obs_shape)
@@ -186,8 +186,8 @@ class BCQImpl(DDPGBaseImpl):
 
     def inner_update(
         self, batch: TorchMiniBatch, grad_step: int
-    ) -> Dict[str, float]:
-        metrics = {}
+    ) -> Dict[str, Union[float, torch.Tensor]]:
+        metrics: Dict[str, Union[float, torch.Tensor]] = {}
         metrics.update(self.update_imitator(batch))
         if grad_step >= self._rl_start_step:
             metrics.update(super().inner_update(batch, grad_step))
@@ -244,7 +244,7 @@ class DiscreteBCQImpl(DoubleDQNImpl):
         imitator_loss = compute_discrete_imitation_loss(
             policy=self._modules.imitator,
             x=batch.observations,
-            action=batch.actions.long(),
+            action=batch.discrete_actions,
             beta=self._beta,
         )
         loss = td_loss + imitator_loss
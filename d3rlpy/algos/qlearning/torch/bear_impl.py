@@ -1,5 +1,5 @@
 import dataclasses
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 
 import torch
 from torch.optim import Optimizer
@@ -99,7 +99,7 @@ class BEARImpl(SACImpl):
         mmd_loss = self._compute_mmd_loss(batch.observations)
         return loss + mmd_loss
 
-    def warmup_actor(self, batch: TorchMiniBatch) -> Dict[str, float]:
+    def warmup_actor(self, batch: TorchMiniBatch) -> Dict[str, torch.Tensor]:
         self._modules.actor_optim.zero_grad()
 
         loss = self._compute_mmd_loss(batch.observations)
@@ -107,14 +107,14 @@ class BEARImpl(SACImpl):
         loss.backward()
         self._modules.actor_optim.step()
 
-        return {"actor_loss": float(loss.cpu().detach().numpy())}
+        return {"actor_loss": loss.detach()}
 
     def _compute_mmd_loss(self, obs_t: torch.Tensor) -> torch.Tensor:
         mmd = self._compute_mmd(obs_t)
         alpha = self._modules.log_alpha().exp()
         return (alpha * (mmd - self._alpha_threshold)).mean()
 
-    def update_imitator(self, batch: TorchMiniBatch) -> Dict[str, float]:
+    def update_imitator(self, batch: TorchMiniBatch) -> Dict[str, torch.Tensor]:
         self._modules.imitator_optim.zero_grad()
 
         loss = self.compute_imitator_loss(batch)
@@ -123,7 +123,7 @@ class BEARImpl(SACImpl):
 
         self._modules.imitator_optim.step()
 
-        return {"imitator_loss": float(loss.cpu().detach().numpy())}
+        return {"imitator_loss": loss.detach()}
 
     def compute_imitator_loss(self, batch: TorchMiniBatch) -> torch.Tensor:
         return compute_vae_error(
@@ -133,7 +133,7 @@ class BEARImpl(SACImpl):
             beta=self._vae_kl_weight,
         )
 
-    def update_alpha(self, batch: TorchMiniBatch) -> Dict[str, float]:
+    def update_alpha(self, batch: TorchMiniBatch) -> Dict[str, torch.Tensor]:
         assert self._modules.alpha_optim
         self._modules.alpha_optim.zero_grad()
 
@@ -145,11 +145,12 @@ class BEARImpl(SACImpl):
         # clip for stability
         self._modules.log_alpha.data.clamp_(-5.0, 10.0)
 
-        cur_alpha = self._modules.log_alpha().exp().cpu().detach().numpy()[0][0]
+        # kept on device to avoid synchronization only for logging
+        cur_alpha = self._modules.log_alpha.data.exp()[0][0]
 
         return {
-            "alpha_loss": float(loss.cpu().detach().numpy()),
-            "alpha": float(cur_alpha),
+            "alpha_loss": loss.detach(),
+            "alpha": cur_alpha,
         }
 
     def _compute_mmd(self, x: torch.Tensor) -> torch.Tensor:
@@ -257,8 +258,8 @@ class BEARImpl(SACImpl):
 
     def inner_update(
         self, batch: TorchMiniBatch, grad_step: int
-    ) -> Dict[str, float]:
-        metrics = {}
+    ) -> Dict[str, Union[float, torch.Tensor]]:
+        metrics: Dict[str, Union[float, torch.Tensor]] = {}
 
         metrics.update(self.update_imitator(batch))
 
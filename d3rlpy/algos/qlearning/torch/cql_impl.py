@@ -1,6 +1,6 @@
 import dataclasses
 import math
-from typing import Dict, Optional
+from typing import Dict, Optional, Union
 
 import torch
 import torch.nn.functional as F
@@ -72,7 +72,7 @@ class CQLImpl(SACImpl):
         )
         return loss + conservative_loss
 
-    def update_alpha(self, batch: TorchMiniBatch) -> Dict[str, float]:
+    def update_alpha(self, batch: TorchMiniBatch) -> Dict[str, torch.Tensor]:
         assert self._modules.alpha_optim
 
         # Q function should be inference mode for stability
@@ -88,11 +88,12 @@ class CQLImpl(SACImpl):
         loss.backward()
         self._modules.alpha_optim.step()
 
-        cur_alpha = self._modules.log_alpha().exp().cpu().detach().numpy()[0][0]
+        # kept on device to avoid synchronization only for logging
+        cur_alpha = self._modules.log_alpha.data.exp()[0][0]
 
         return {
-            "alpha_loss": float(loss.cpu().detach().numpy()),
-            "alpha": float(cur_alpha),
+            "alpha_loss": loss.detach(),
+            "alpha": cur_alpha,
         }
 
     def _compute_policy_is_values(
@@ -198,8 +199,8 @@ class CQLImpl(SACImpl):
 
     def inner_update(
         self, batch: TorchMiniBatch, grad_step: int
-    ) -> Dict[str, float]:
-        metrics = {}
+    ) -> Dict[str, Union[float, torch.Tensor]]:
+        metrics: Dict[str, Union[float, torch.Tensor]] = {}
 
         # lagrangian parameter update for SAC temperature
         if self._modules.temp_optim:
@@ -270,7 +271,7 @@ class DiscreteCQLImpl(DoubleDQNImpl):
     ) -> DiscreteCQLLoss:
         td_loss = super().compute_loss(batch, q_tpn).loss
         conservative_loss = self._compute_conservative_loss(
-            batch.observations, batch.actions.long()
+            batch.observations, batch.discrete_actions
         )
         loss = td_loss + self._alpha * conservative_loss
         return DiscreteCQLLoss(
@@ -1,5 +1,5 @@
 import dataclasses
-from typing import Dict
+from typing import Dict, Union
 
 import torch
 import torch.nn.functional as F
@@ -185,8 +185,8 @@ class CRRImpl(DDPGBaseImpl):
 
     def inner_update(
         self, batch: TorchMiniBatch, grad_step: int
-    ) -> Dict[str, float]:
-        metrics = {}
+    ) -> Dict[str, Union[float, torch.Tensor]]:
+        metrics: Dict[str, Union[float, torch.Tensor]] = {}
         metrics.update(self.update_critic(batch))
         metrics.update(self.update_actor(batch))
 
@@ -1,6 +1,6 @@
 import dataclasses
 from abc import ABCMeta, abstractmethod
-from typing import Dict
+from typing import Dict, Union
 
 import torch
 from torch import nn
@@ -56,7 +56,7 @@ class DDPGBaseImpl(
         self._targ_q_func_forwarder = targ_q_func_forwarder
         hard_sync(self._modules.targ_q_funcs, self._modules.q_funcs)
 
-    def update_critic(self, batch: TorchMiniBatch) -> Dict[str, float]:
+    def update_critic(self, batch: TorchMiniBatch) -> Dict[str, torch.Tensor]:
         self._modules.critic_optim.zero_grad()
 
         q_tpn = self.compute_target(batch)
@@ -66,7 +66,7 @@ class DDPGBaseImpl(
         loss.backward()
         self._modules.critic_optim.step()
 
-        return {"critic_loss": float(loss.cpu().detach().numpy())}
+        return {"critic_loss": loss.detach()}
 
     def compute_critic_loss(
         self, batch: TorchMiniBatch, q_tpn: torch.Tensor
@@ -77,10 +77,10 @@ class DDPGBaseImpl(
             rewards=batch.rewards,
             target=q_tpn,
             terminals=batch.terminals,
-            gamma=self._gamma**batch.intervals,
+            gamma=batch.compute_discounts(self._gamma),
         )
 
-    def update_actor(self, batch: TorchMiniBatch) -> Dict[str, float]:
+    def update_actor(self, batch: TorchMiniBatch) -> Dict[str, torch.Tensor]:
         # Q function should be inference mode for stability
         self._modules.q_funcs.eval()
 
@@ -91,12 +91,12 @@ class DDPGBaseImpl(
         loss.backward()
         self._modules.actor_optim.step()
 
-        return {"actor_loss": float(loss.cpu().detach().numpy())}
+        return {"actor_loss": loss.detach()}
 
     def inner_update(
         self, batch: TorchMiniBatch, grad_step: int
-    ) -> Dict[str, float]:
-        metrics = {}
+    ) -> Dict[str, Union[float, torch.Tensor]]:
+        metrics: Dict[str, Union[float, torch.Tensor]] = {}
         metrics.update(self.update_critic(batch))
         metrics.update(self.update_actor(batch))
         self.update_critic_target()
@@ -192,7 +192,7 @@ class DDPGImpl(DDPGBaseImpl):
 
     def inner_update(
         self, batch: TorchMiniBatch, grad_step: int
-    ) -> Dict[str, float]:
+    ) -> Dict[str, Union[float, torch.Tensor]]:
         metrics = super().inner_update(batch, grad_step)
         self.update_actor_target()
         return metrics
@@ -1,19 +1,31 @@
 import dataclasses
-from typing import Dict
+from typing import BinaryIO, Dict, Optional, Union
 
 import torch
 from torch import nn
 from torch.optim import Optimizer
 
-from ....dataclass_utils import asdict_as_float
+from ....dataclass_utils import asdict_detached
 from ....dataset import Shape
-from ....models.torch import DiscreteEnsembleQFunctionForwarder
-from ....torch_utility import Modules, TorchMiniBatch, hard_sync
+from ....models.torch import (
+    DiscreteEnsembleQFunctionForwarder,
+    pick_quantile_value_by_action,
+    pick_value_by_action,
+)
+from ....torch_utility import (
+    Modules,
+    TorchMiniBatch,
+    bf16_autocast,
+    hard_sync,
+)
 from ..base import QLearningAlgoImplBase
 from .utility import DiscreteQFunctionMixin
 
 __all__ = ["DQNImpl", "DQNModules", "DQNLoss", "DoubleDQNImpl"]
 
+# number of eager updates before the update step is captured
+_CUDA_GRAPH_WARMUP_STEPS = 3
+
 
 @dataclasses.dataclass(frozen=True)
 class DQNModules(Modules):
@@ -33,6 +45,14 @@ class DQNImpl(DiscreteQFunctionMixin, QLearningAlgoImplBase):
     _q_func_forwarder: DiscreteEnsembleQFunctionForwarder
     _targ_q_func_forwarder: DiscreteEnsembleQFunctionForwarder
     _target_update_interval: int
+    _accumulation_steps: int
+    _accum_counter: int
+    _use_cuda_graph: bool
+    _n_warmup_updates: int
+    _graph: Optional[torch.cuda.CUDAGraph]
+    _static_batch: Optional[TorchMiniBatch]
+    _static_metrics: Dict[str, torch.Tensor]
+    _use_amp: bool
 
     def __init__(
         self,
@@ -44,6 +64,9 @@ class DQNImpl(DiscreteQFunctionMixin, QLearningAlgoImplBase):
         target_update_interval: int,
         gamma: float,
         device: str,
+        accumulation_steps: int = 1,
+        use_cuda_graph: bool = False,
+        use_amp: bool = False,
     ):
         super().__init__(
             observation_shape=observation_shape,
@@ -51,55 +74,183 @@ class DQNImpl(DiscreteQFunctionMixin, QLearningAlgoImplBase):
             modules=modules,
             device=device,
         )
+        if accumulation_steps < 1:
+            raise ValueError("accumulation_steps must be at least 1.")
+        if use_cuda_graph and accumulation_steps != 1:
+            raise ValueError(
+                "CUDA Graphs do not support gradient accumulation."
+            )
+        if use_cuda_graph and use_amp:
+            # autocast weight cast cache is not safe to use under capture
+            raise ValueError("CUDA Graphs do not support bfloat16 autocast.")
+        if use_cuda_graph and "cuda" not in device:
+            raise ValueError("CUDA Graphs require a CUDA device.")
         self._gamma = gamma
         self._q_func_forwarder = q_func_forwarder
         self._targ_q_func_forwarder = targ_q_func_forwarder
         self._target_update_interval = target_update_interval
+        self._accumulation_steps = accumulation_steps
+        self._accum_counter = 0
+        self._use_cuda_graph = use_cuda_graph
+        self._n_warmup_updates = 0
+        self._graph = None
+        self._static_batch = None
+        self._static_metrics = {}
+        self._use_amp = use_amp
+        if use_cuda_graph:
+            self._make_optim_capturable()
         hard_sync(modules.targ_q_funcs, modules.q_funcs)
 
     def inner_update(
         self, batch: TorchMiniBatch, grad_step: int
-    ) -> Dict[str, float]:
-        self._modules.optim.zero_grad()
+    ) -> Dict[str, Union[float, torch.Tensor]]:
+        metrics: Dict[str, Union[float, torch.Tensor]] = {}
+        if not self._use_cuda_graph:
+            metrics.update(self.update_q_func(batch))
+        elif self._graph is None:
+            metrics.update(self._warmup_or_capture(batch))
+        else:
+            self._copy_to_static_batch(batch)
+            self._graph.replay()
+            metrics.update(self._clone_static_metrics())
+
+        if grad_step % self._target_update_interval == 0:
+            self.update_target()
+
+        return metrics
+
+    def update_q_func(self, batch: TorchMiniBatch) -> Dict[str, torch.Tensor]:
+        if self._accum_counter == 0:
+            self._modules.optim.zero_grad(set_to_none=True)
 
         q_tpn = self.compute_target(batch)
 
         loss = self.compute_loss(batch, q_tpn)
 
-        loss.loss.backward()
-        self._modules.optim.step()
+        # accumulate gradients over micro-batches
+        (loss.loss / self._accumulation_steps).backward()
+        self._accum_counter += 1
+        if self._accum_counter == self._accumulation_steps:
+            self._modules.optim.step()
+            self._accum_counter = 0
 
-        if grad_step % self._target_update_interval == 0:
-            self.update_target()
+        return asdict_detached(loss)
+
+    def _warmup_or_capture(
+        self, batch: TorchMiniBatch
+    ) -> Dict[str, torch.Tensor]:
+        if self._n_warmup_updates < _CUDA_GRAPH_WARMUP_STEPS:
+            # eager updates on a side stream initialize optimizer states and
+            # library workspaces before capture
+            main_stream = torch.cuda.current_stream(self._device)
+            stream = torch.cuda.Stream(device=self._device)
+            stream.wait_stream(main_stream)
+            with torch.cuda.stream(stream):
+                metrics = self.update_q_func(batch)
+            main_stream.wait_stream(stream)
+            self._n_warmup_updates += 1
+            return metrics
+
+        # new batches are copied into these buffers before each replay
+        self._static_batch = TorchMiniBatch(
+            observations=batch.observations.clone(),
+            actions=batch.actions.clone(),
+            rewards=batch.rewards.clone(),
+            next_observations=batch.next_observations.clone(),
+            terminals=batch.terminals.clone(),
+            intervals=batch.intervals.clone(),
+            device=batch.device,
+        )
+        self._modules.optim.zero_grad(set_to_none=True)
+        self._graph = torch.cuda.CUDAGraph()
+        with torch.cuda.graph(self._graph):
+            self._static_metrics = self.update_q_func(self._static_batch)
+
+        # capture only records kernels
+        self._graph.replay()
+        return self._clone_static_metrics()
+
+    def _clone_static_metrics(self) -> Dict[str, torch.Tensor]:
+        # static outputs are overwritten by the next replay
+        return {k: v.clone() for k, v in self._static_metrics.items()}
+
+    def _make_optim_capturable(self) -> None:
+        # optimizer states need to live on device to be captured
+        optim = self._modules.optim
+        for group in optim.param_groups:
+            if "capturable" in group:
+                group["capturable"] = True
+            # load_state_dict keeps step counters on CPU
+            for param in group["params"]:
+                state = optim.state.get(param, {})
+                step = state.get("step")
+                if torch.is_tensor(step) and step.device != param.device:
+                    state["step"] = step.to(param.device)
+
+    def _reset_cuda_graph(self) -> None:
+        # captured kernels point to optimizer states that have been replaced
+        if not self._use_cuda_graph:
+            return
+        self._graph = None
+        self._static_batch = None
+        self._static_metrics = {}
+        self._n_warmup_updates = 0
+        self._make_optim_capturable()
+
+    def load_model(self, f: BinaryIO) -> None:
+        super().load_model(f)
+        # partially accumulated gradients are discarded
+        self._accum_counter = 0
+        self._reset_cuda_graph()
 
-        return asdict_as_float(loss)
+    def copy_q_function_optim_from(self, impl: QLearningAlgoImplBase) -> None:
+        super().copy_q_function_optim_from(impl)
+        self._reset_cuda_graph()
+
+    def reset_optimizer_states(self) -> None:
+        super().reset_optimizer_states()
+        # partially accumulated gradients are discarded
+        self._accum_counter = 0
+        self._reset_cuda_graph()
+
+    def _copy_to_static_batch(self, batch: TorchMiniBatch) -> None:
+        assert self._static_batch is not None
+        self._static_batch.observations.copy_(batch.observations)
+        self._static_batch.actions.copy_(batch.actions)
+        self._static_batch.rewards.copy_(batch.rewards)
+        self._static_batch.next_observations.copy_(batch.next_observations)
+        self._static_batch.terminals.copy_(batch.terminals)
+        self._static_batch.intervals.copy_(batch.intervals)
 
     def compute_loss(
         self,
         batch: TorchMiniBatch,
         q_tpn: torch.Tensor,
     ) -> DQNLoss:
-        loss = self._q_func_forwarder.compute_error(
-            observations=batch.observations,
-            actions=batch.actions.long(),
-            rewards=batch.rewards,
-            target=q_tpn,
-            terminals=batch.terminals,
-            gamma=self._gamma**batch.intervals,
-        )
-        return DQNLoss(loss=loss)
+        with bf16_autocast(self._device, self._use_amp):
+            loss = self._q_func_forwarder.compute_error(
+                observations=batch.observations,
+                actions=batch.discrete_actions,
+                rewards=batch.rewards,
+                target=q_tpn,
+                terminals=batch.terminals,
+                gamma=batch.compute_discounts(self._gamma),
+            )
+        # keep the loss in float32
+        return DQNLoss(loss=loss.float())
 
     def compute_target(self, batch: TorchMiniBatch) -> torch.Tensor:
-        with torch.no_grad():
+        with torch.inference_mode(), bf16_autocast(self._device, self._use_amp):
             next_actions = self._targ_q_func_forwarder.compute_expected_q(
                 batch.next_observations
             )
             max_action = next_actions.argmax(dim=1)
-            return self._targ_q_func_forwarder.compute_target(
+            target = self._targ_q_func_forwarder.compute_target(
                 batch.next_observations,
                 max_action,
                 reduction="min",
             )
+            return target.float()
 
     def inner_predict_best_action(self, x: torch.Tensor) -> torch.Tensor:
         return self._q_func_forwarder.compute_expected_q(x).argmax(dim=1)
@@ -120,11 +271,66 @@ class DQNImpl(DiscreteQFunctionMixin, QLearningAlgoImplBase):
 
 
 class DoubleDQNImpl(DQNImpl):
+    _side_stream: Optional[torch.cuda.Stream]
+
+    def __init__(
+        self,
+        observation_shape: Shape,
+        action_size: int,
+        modules: DQNModules,
+        q_func_forwarder: DiscreteEnsembleQFunctionForwarder,
+        targ_q_func_forwarder: DiscreteEnsembleQFunctionForwarder,
+        target_update_interval: int,
+        gamma: float,
+        device: str,
+        accumulation_steps: int = 1,
+        use_cuda_graph: bool = False,
+        use_amp: bool = False,
+    ):
+        super().__init__(
+            observation_shape=observation_shape,
+            action_size=action_size,
+            modules=modules,
+            q_func_forwarder=q_func_forwarder,
+            targ_q_func_forwarder=targ_q_func_forwarder,
+            target_update_interval=target_update_interval,
+            gamma=gamma,
+            device=device,
+            accumulation_steps=accumulation_steps,
+            use_cuda_graph=use_cuda_graph,
+            use_amp=use_amp,
+        )
+        if "cuda" in device:
+            self._side_stream = torch.cuda.Stream(device=device)
+        else:
+            self._side_stream = None
+
     def compute_target(self, batch: TorchMiniBatch) -> torch.Tensor:
-        with torch.no_grad():
-            action = self.inner_predict_best_action(batch.next_observations)
-            return self._targ_q_func_forwarder.compute_target(
-                batch.next_observations,
-                action,
-                reduction="min",
-            )
+        with torch.inference_mode(), bf16_autocast(self._device, self._use_amp):
+            # side stream is not forked while capturing a CUDA graph
+            if (
+                self._side_stream is None
+                or torch.cuda.is_current_stream_capturing()
+            ):
+                targ_values = self._targ_q_func_forwarder.compute_target(
+                    batch.next_observations, reduction="min"
+                )
+                action = self.inner_predict_best_action(batch.next_observations)
+            else:
+                # overlap target and online network forwards
+                main_stream = torch.cuda.current_stream(self._device)
+                self._side_stream.wait_stream(main_stream)
+                with torch.cuda.stream(self._side_stream):
+                    targ_values = self._targ_q_func_forwarder.compute_target(
+                        batch.next_observations, reduction="min"
+                    )
+                action = self.inner_predict_best_action(batch.next_observations)
+                main_stream.wait_stream(self._side_stream)
+                targ_values.record_stream(main_stream)
+
+            # pick target values of the actions chosen by online network
+            if targ_values.dim() == 3:
+                target = pick_quantile_value_by_action(targ_values, action)
+            else:
+                target = pick_value_by_action(targ_values, action, keepdim=True)
+            return target.float()
@@ -1,5 +1,5 @@
 import dataclasses
-from typing import Dict
+from typing import Dict, Union
 
 import torch
 
@@ -65,7 +65,7 @@ class IQLImpl(DDPGBaseImpl):
             rewards=batch.rewards,
             target=q_tpn,
             terminals=batch.terminals,
-            gamma=self._gamma**batch.intervals,
+            gamma=batch.compute_discounts(self._gamma),
         )
 
     def compute_target(self, batch: TorchMiniBatch) -> torch.Tensor:
@@ -104,7 +104,7 @@ class IQLImpl(DDPGBaseImpl):
 
     def update_critic_and_state_value(
         self, batch: TorchMiniBatch
-    ) -> Dict[str, float]:
+    ) -> Dict[str, torch.Tensor]:
         self._modules.critic_optim.zero_grad()
 
         # compute Q-function loss
@@ -120,8 +120,8 @@ class IQLImpl(DDPGBaseImpl):
         self._modules.critic_optim.step()
 
         return {
-            "critic_loss": float(q_loss.cpu().detach().numpy()),
-            "v_loss": float(v_loss.cpu().detach().numpy()),
+            "critic_loss": q_loss.detach(),
+            "v_loss": v_loss.detach(),
         }
 
     def inner_sample_action(self, x: torch.Tensor) -> torch.Tensor:
@@ -130,8 +130,8 @@ class IQLImpl(DDPGBaseImpl):
 
     def inner_update(
         self, batch: TorchMiniBatch, grad_step: int
-    ) -> Dict[str, float]:
-        metrics = {}
+    ) -> Dict[str, Union[float, torch.Tensor]]:
+        metrics: Dict[str, Union[float, torch.Tensor]] = {}
         metrics.update(self.update_critic_and_state_value(batch))
         metrics.update(self.update_actor(batch))
         self.update_critic_target()
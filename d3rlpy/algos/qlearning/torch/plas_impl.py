@@ -1,5 +1,5 @@
 import dataclasses
-from typing import Dict
+from typing import Dict, Union
 
 import torch
 from torch.optim import Optimizer
@@ -66,7 +66,7 @@ class PLASImpl(DDPGBaseImpl):
         self._beta = beta
         self._warmup_steps = warmup_steps
 
-    def update_imitator(self, batch: TorchMiniBatch) -> Dict[str, float]:
+    def update_imitator(self, batch: TorchMiniBatch) -> Dict[str, torch.Tensor]:
         self._modules.imitator_optim.zero_grad()
 
         loss = compute_vae_error(
@@ -79,7 +79,7 @@ class PLASImpl(DDPGBaseImpl):
         loss.backward()
         self._modules.imitator_optim.step()
 
-        return {"imitator_loss": float(loss.cpu().detach().numpy())}
+        return {"imitator_loss": loss.detach()}
 
     def compute_actor_loss(self, batch: TorchMiniBatch) -> torch.Tensor:
         latent_actions = (
@@ -120,8 +120,8 @@ class PLASImpl(DDPGBaseImpl):
 
     def inner_update(
         self, batch: TorchMiniBatch, grad_step: int
-    ) -> Dict[str, float]:
-        metrics = {}
+    ) -> Dict[str, Union[float, torch.Tensor]]:
+        metrics: Dict[str, Union[float, torch.Tensor]] = {}
 
         if grad_step < self._warmup_steps:
             metrics.update(self.update_imitator(batch))
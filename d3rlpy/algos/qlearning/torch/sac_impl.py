@@ -1,9 +1,8 @@
 import dataclasses
 import math
-from typing import Dict, Optional
+from typing import BinaryIO, Callable, Dict, Optional, Union
 
 import torch
-import torch.nn.functional as F
 from torch import nn
 from torch.optim import Optimizer
 
@@ -17,7 +16,12 @@ from ....models.torch import (
     Policy,
     build_squashed_gaussian_distribution,
 )
-from ....torch_utility import Modules, TorchMiniBatch, hard_sync
+from ....torch_utility import (
+    Modules,
+    TorchMiniBatch,
+    bf16_autocast,
+    hard_sync,
+)
 from ..base import QLearningAlgoImplBase
 from .ddpg_impl import DDPGBaseImpl, DDPGBaseModules
 from .utility import DiscreteQFunctionMixin
@@ -32,8 +36,28 @@ class SACModules(DDPGBaseModules):
     temp_optim: Optional[Optimizer]
 
 
+def _maybe_compile(
+    func: Callable[..., torch.Tensor], compile_graph: bool
+) -> Callable[..., torch.Tensor]:
+    # only the elementwise glue is compiled since network forwards are
+    # already dispatched to fused kernels
+    if compile_graph:
+        return torch.compile(func, dynamic=True, fullgraph=True)  # type: ignore
+    return func
+
+
+def _sac_target_math(
+    target: torch.Tensor, log_prob: torch.Tensor, temp: torch.Tensor
+) -> torch.Tensor:
+    # target - temp * log_prob in a single kernel without entropy tensor
+    return torch.addcmul(target, temp, log_prob, value=-1.0)
+
+
 class SACImpl(DDPGBaseImpl):
     _modules: SACModules
+    _last_log_prob: Optional[torch.Tensor]
+    _target_math: Callable[..., torch.Tensor]
+    _use_amp: bool
 
     def __init__(
         self,
@@ -45,6 +69,8 @@ class SACImpl(DDPGBaseImpl):
         gamma: float,
         tau: float,
         device: str,
+        compile_target_math: bool = False,
+        use_amp: bool = False,
     ):
         super().__init__(
             observation_shape=observation_shape,
@@ -56,27 +82,49 @@ class SACImpl(DDPGBaseImpl):
             tau=tau,
             device=device,
         )
+        self._last_log_prob = None
+        self._target_math = _maybe_compile(
+            _sac_target_math, compile_target_math
+        )
+        self._use_amp = use_amp
 
     def compute_actor_loss(self, batch: TorchMiniBatch) -> torch.Tensor:
         dist = build_squashed_gaussian_distribution(
             self._modules.policy(batch.observations)
         )
         action, log_prob = dist.sample_with_log_prob()
-        entropy = self._modules.log_temp().exp() * log_prob
-        q_t = self._q_func_forwarder.compute_expected_q(
-            batch.observations, action, "min"
-        )
-        return (entropy - q_t).mean()
+        # reused by the temperature update to skip another policy forward
+        self._last_log_prob = log_prob.detach()
+        entropy = self._temp() * log_prob
+        with bf16_autocast(self._device, self._use_amp):
+            q_t = self._q_func_forwarder.compute_expected_q(
+                batch.observations, action, "min"
+            )
+        return (entropy - q_t.float()).mean()
 
-    def update_temp(self, batch: TorchMiniBatch) -> Dict[str, float]:
-        assert self._modules.temp_optim
-        self._modules.temp_optim.zero_grad()
+    def compute_critic_loss(
+        self, batch: TorchMiniBatch, q_tpn: torch.Tensor
+    ) -> torch.Tensor:
+        with bf16_autocast(self._device, self._use_amp):
+            loss = super().compute_critic_loss(batch, q_tpn)
+        # keep the loss in float32
+        return loss.float()
 
-        with torch.no_grad():
+    def update_temp(self, batch: TorchMiniBatch) -> Dict[str, torch.Tensor]:
+        with torch.inference_mode():
             dist = build_squashed_gaussian_distribution(
                 self._modules.policy(batch.observations)
             )
-            _, log_prob = dist.sample_with_log_prob()
+            log_prob = dist.sample_log_prob()
+        return self.update_temp_from_log_prob(log_prob)
+
+    def update_temp_from_log_prob(
+        self, log_prob: torch.Tensor
+    ) -> Dict[str, torch.Tensor]:
+        assert self._modules.temp_optim
+        self._modules.temp_optim.zero_grad(set_to_none=True)
+
+        with torch.no_grad():
             targ_temp = log_prob - self._action_size
 
         loss = -(self._modules.log_temp().exp() * targ_temp).mean()
@@ -85,40 +133,70 @@ class SACImpl(DDPGBaseImpl):
         self._modules.temp_optim.step()
 
         # current temperature value
-        cur_temp = self._modules.log_temp().exp().cpu().detach().numpy()[0][0]
+        cur_temp = self._temp()[0][0]
 
         return {
-            "temp_loss": float(loss.cpu().detach().numpy()),
-            "temp": float(cur_temp),
+            "temp_loss": loss.detach(),
+            "temp": cur_temp,
         }
 
     def compute_target(self, batch: TorchMiniBatch) -> torch.Tensor:
-        with torch.no_grad():
+        with torch.inference_mode():
             dist = build_squashed_gaussian_distribution(
                 self._modules.policy(batch.next_observations)
             )
             action, log_prob = dist.sample_with_log_prob()
-            entropy = self._modules.log_temp().exp() * log_prob
-            target = self._targ_q_func_forwarder.compute_target(
-                batch.next_observations,
-                action,
-                reduction="min",
-            )
-            return target - entropy
+            with bf16_autocast(self._device, self._use_amp):
+                target = self._targ_q_func_forwarder.compute_target(
+                    batch.next_observations,
+                    action,
+                    reduction="min",
+                )
+            return self._target_math(target.float(), log_prob, self._temp())
 
     def inner_update(
         self, batch: TorchMiniBatch, grad_step: int
-    ) -> Dict[str, float]:
-        metrics = {}
-        if self._modules.temp_optim:
-            metrics.update(self.update_temp(batch))
+    ) -> Dict[str, Union[float, torch.Tensor]]:
+        metrics: Dict[str, Union[float, torch.Tensor]] = {}
         metrics.update(super().inner_update(batch, grad_step))
+        # temperature update must follow update_actor to reuse log_prob
+        if self._modules.temp_optim:
+            assert self._last_log_prob is not None
+            metrics.update(self.update_temp_from_log_prob(self._last_log_prob))
         return metrics
 
     def inner_sample_action(self, x: torch.Tensor) -> torch.Tensor:
         dist = build_squashed_gaussian_distribution(self._modules.policy(x))
         return dist.sample()
 
+    def _temp(self) -> torch.Tensor:
+        # temperature is treated as a constant outside of update_temp
+        return self._modules.log_temp.data.exp()
+
+
+def _compute_discrete_target(
+    log_probs: torch.Tensor, target: torch.Tensor, temp: torch.Tensor
+) -> torch.Tensor:
+    # Categorical.logits are already normalized log-probabilities
+    probs = log_probs.exp()
+    if target.dim() == 3:
+        # quantiles are contracted directly without broadcasting log_probs
+        expct_log_probs = (probs * log_probs).sum(dim=1, keepdim=True)
+        expct_target = torch.einsum("ba,ban->bn", probs, target)
+        return expct_target - temp * expct_log_probs
+    # target - temp * log_probs in a single kernel
+    soft_target = torch.addcmul(target, temp, log_probs, value=-1.0)
+    return (probs * soft_target).sum(dim=1, keepdim=True)
+
+
+def _compute_discrete_actor_loss(
+    log_probs: torch.Tensor, q_t: torch.Tensor, temp: torch.Tensor
+) -> torch.Tensor:
+    probs = log_probs.exp()
+    # q_t - temp * log_probs in a single kernel
+    soft_q = torch.addcmul(q_t, temp, log_probs, value=-1.0)
+    return -(probs * soft_q).sum(dim=1).mean()
+
 
 @dataclasses.dataclass(frozen=True)
 class DiscreteSACModules(Modules):
@@ -136,6 +214,11 @@ class DiscreteSACImpl(DiscreteQFunctionMixin, QLearningAlgoImplBase):
     _q_func_forwarder: DiscreteEnsembleQFunctionForwarder
     _targ_q_func_forwarder: DiscreteEnsembleQFunctionForwarder
     _target_update_interval: int
+    _accumulation_steps: int
+    _accum_counter: int
+    _last_log_probs: Optional[torch.Tensor]
+    _target_math: Callable[..., torch.Tensor]
+    _use_amp: bool
 
     def __init__(
         self,
@@ -147,6 +230,9 @@ class DiscreteSACImpl(DiscreteQFunctionMixin, QLearningAlgoImplBase):
         target_update_interval: int,
         gamma: float,
         device: str,
+        accumulation_steps: int = 1,
+        compile_target_math: bool = False,
+        use_amp: bool = False,
     ):
         super().__init__(
             observation_shape=observation_shape,
@@ -154,85 +240,104 @@ class DiscreteSACImpl(DiscreteQFunctionMixin, QLearningAlgoImplBase):
             modules=modules,
             device=device,
         )
+        if accumulation_steps < 1:
+            raise ValueError("accumulation_steps must be at least 1.")
         self._gamma = gamma
         self._q_func_forwarder = q_func_forwarder
         self._targ_q_func_forwarder = targ_q_func_forwarder
         self._target_update_interval = target_update_interval
+        self._accumulation_steps = accumulation_steps
+        self._accum_counter = 0
+        self._last_log_probs = None
+        self._target_math = _maybe_compile(
+            _compute_discrete_target, compile_target_math
+        )
+        self._use_amp = use_amp
         hard_sync(modules.targ_q_funcs, modules.q_funcs)
 
-    def update_critic(self, batch: TorchMiniBatch) -> Dict[str, float]:
-        self._modules.critic_optim.zero_grad()
+    def update_critic(self, batch: TorchMiniBatch) -> Dict[str, torch.Tensor]:
+        if self._accum_counter == 0:
+            self._modules.critic_optim.zero_grad(set_to_none=True)
 
         q_tpn = self.compute_target(batch)
         loss = self.compute_critic_loss(batch, q_tpn)
 
-        loss.backward()
-        self._modules.critic_optim.step()
+        # accumulate gradients over micro-batches
+        (loss / self._accumulation_steps).backward()
+        self._accum_counter += 1
+        if self._accum_counter == self._accumulation_steps:
+            self._modules.critic_optim.step()
+            self._accum_counter = 0
 
-        return {"critic_loss": float(loss.cpu().detach().numpy())}
+        return {"critic_loss": loss.detach()}
 
     def compute_target(self, batch: TorchMiniBatch) -> torch.Tensor:
-        with torch.no_grad():
+        with torch.inference_mode():
             dist = self._modules.policy(batch.next_observations)
-            log_probs = dist.logits
-            probs = dist.probs
-            entropy = self._modules.log_temp().exp() * log_probs
-            target = self._targ_q_func_forwarder.compute_target(
-                batch.next_observations
-            )
-            keepdims = True
-            if target.dim() == 3:
-                entropy = entropy.unsqueeze(-1)
-                probs = probs.unsqueeze(-1)
-                keepdims = False
-            return (probs * (target - entropy)).sum(dim=1, keepdim=keepdims)
+            with bf16_autocast(self._device, self._use_amp):
+                target = self._targ_q_func_forwarder.compute_target(
+                    batch.next_observations
+                )
+            return self._target_math(dist.logits, target.float(), self._temp())
 
     def compute_critic_loss(
         self,
         batch: TorchMiniBatch,
         q_tpn: torch.Tensor,
     ) -> torch.Tensor:
-        return self._q_func_forwarder.compute_error(
-            observations=batch.observations,
-            actions=batch.actions.long(),
-            rewards=batch.rewards,
-            target=q_tpn,
-            terminals=batch.terminals,
-            gamma=self._gamma**batch.intervals,
-        )
+        with bf16_autocast(self._device, self._use_amp):
+            loss = self._q_func_forwarder.compute_error(
+                observations=batch.observations,
+                actions=batch.discrete_actions,
+                rewards=batch.rewards,
+                target=q_tpn,
+                terminals=batch.terminals,
+                gamma=batch.compute_discounts(self._gamma),
+            )
+        # keep the loss in float32
+        return loss.float()
 
-    def update_actor(self, batch: TorchMiniBatch) -> Dict[str, float]:
+    def update_actor(self, batch: TorchMiniBatch) -> Dict[str, torch.Tensor]:
         # Q function should be inference mode for stability
         self._modules.q_funcs.eval()
 
-        self._modules.actor_optim.zero_grad()
+        self._modules.actor_optim.zero_grad(set_to_none=True)
 
         loss = self.compute_actor_loss(batch)
 
         loss.backward()
         self._modules.actor_optim.step()
 
-        return {"actor_loss": float(loss.cpu().detach().numpy())}
+        return {"actor_loss": loss.detach()}
 
     def compute_actor_loss(self, batch: TorchMiniBatch) -> torch.Tensor:
-        with torch.no_grad():
+        with torch.inference_mode(), bf16_autocast(self._device, self._use_amp):
             q_t = self._q_func_forwarder.compute_expected_q(
                 batch.observations, reduction="min"
-            )
+            ).float()
         dist = self._modules.policy(batch.observations)
-        log_probs = dist.logits
-        probs = dist.probs
-        entropy = self._modules.log_temp().exp() * log_probs
-        return (probs * (entropy - q_t)).sum(dim=1).mean()
+        # reused by the temperature update to skip another policy forward
+        self._last_log_probs = dist.logits.detach()
+        return _compute_discrete_actor_loss(
+            log_probs=dist.logits,
+            q_t=q_t,
+            temp=self._temp(),
+        )
 
-    def update_temp(self, batch: TorchMiniBatch) -> Dict[str, float]:
+    def update_temp(self, batch: TorchMiniBatch) -> Dict[str, torch.Tensor]:
+        with torch.inference_mode():
+            dist = self._modules.policy(batch.observations)
+            log_probs = dist.logits
+        return self.update_temp_from_log_probs(log_probs)
+
+    def update_temp_from_log_probs(
+        self, log_probs: torch.Tensor
+    ) -> Dict[str, torch.Tensor]:
         assert self._modules.temp_optim
-        self._modules.temp_optim.zero_grad()
+        self._modules.temp_optim.zero_grad(set_to_none=True)
 
         with torch.no_grad():
-            dist = self._modules.policy(batch.observations)
-            log_probs = F.log_softmax(dist.logits, dim=1)
-            probs = dist.probs
+            probs = log_probs.exp()
             expct_log_probs = (probs * log_probs).sum(dim=1, keepdim=True)
             entropy_target = 0.98 * (-math.log(1 / self.action_size))
             targ_temp = expct_log_probs + entropy_target
@@ -243,23 +348,27 @@ class DiscreteSACImpl(DiscreteQFunctionMixin, QLearningAlgoImplBase):
         self._modules.temp_optim.step()
 
         # current temperature value
-        cur_temp = self._modules.log_temp().exp().cpu().detach().numpy()[0][0]
+        cur_temp = self._temp()[0][0]
 
         return {
-            "temp_loss": float(loss.cpu().detach().numpy()),
-            "temp": float(cur_temp),
+            "temp_loss": loss.detach(),
+            "temp": cur_temp,
         }
 
     def inner_update(
         self, batch: TorchMiniBatch, grad_step: int
-    ) -> Dict[str, float]:
-        metrics = {}
+    ) -> Dict[str, Union[float, torch.Tensor]]:
+        metrics: Dict[str, Union[float, torch.Tensor]] = {}
+        metrics.update(self.update_critic(batch))
+        metrics.update(self.update_actor(batch))
 
         # lagrangian parameter update for SAC temeprature
+        # this must follow update_actor to reuse log-probabilities
         if self._modules.temp_optim:
-            metrics.update(self.update_temp(batch))
-        metrics.update(self.update_critic(batch))
-        metrics.update(self.update_actor(batch))
+            assert self._last_log_probs is not None
+            metrics.update(
+                self.update_temp_from_log_probs(self._last_log_probs)
+            )
 
         if grad_step % self._target_update_interval == 0:
             self.update_target()
@@ -277,6 +386,20 @@ class DiscreteSACImpl(DiscreteQFunctionMixin, QLearningAlgoImplBase):
     def update_target(self) -> None:
         hard_sync(self._modules.targ_q_funcs, self._modules.q_funcs)
 
+    def load_model(self, f: BinaryIO) -> None:
+        super().load_model(f)
+        # partially accumulated gradients are discarded
+        self._accum_counter = 0
+
+    def reset_optimizer_states(self) -> None:
+        super().reset_optimizer_states()
+        # partially accumulated gradients are discarded
+        self._accum_counter = 0
+
+    def _temp(self) -> torch.Tensor:
+        # temperature is treated as a constant outside of update_temp
+        return self._modules.log_temp.data.exp()
+
     @property
     def policy(self) -> Policy:
         return self._modules.policy
@@ -65,7 +65,7 @@ class DecisionTransformerImpl(TransformerAlgoImplBase):
         self._modules.optim.step()
         self._scheduler.step()
 
-        return {"loss": float(loss.cpu().detach().numpy())}
+        return {"loss": loss.item()}
 
     def compute_loss(self, batch: TorchTrajectoryMiniBatch) -> torch.Tensor:
         action = self._modules.transformer(
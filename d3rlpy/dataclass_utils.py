@@ -3,7 +3,7 @@ from typing import Any, Dict
 
 import torch
 
-__all__ = ["asdict_without_copy", "asdict_as_float"]
+__all__ = ["asdict_without_copy", "asdict_as_float", "asdict_detached"]
 
 
 def asdict_without_copy(obj: Any) -> Dict[str, Any]:
@@ -19,7 +19,20 @@ def asdict_as_float(obj: Any) -> Dict[str, float]:
     for field in fields:
         value = getattr(obj, field.name)
         if isinstance(value, torch.Tensor):
-            ret[field.name] = float(value.cpu().detach().numpy())
+            ret[field.name] = value.item()
         else:
             ret[field.name] = float(value)
     return ret
+
+
+def asdict_detached(obj: Any) -> Dict[str, Any]:
+    assert dataclasses.is_dataclass(obj)
+    fields = dataclasses.fields(obj)
+    ret: Dict[str, Any] = {}
+    for field in fields:
+        value = getattr(obj, field.name)
+        if isinstance(value, torch.Tensor):
+            ret[field.name] = value.detach()
+        else:
+            ret[field.name] = value
+    return ret
@@ -128,6 +128,12 @@ class SquashedGaussianDistribution(Distribution):
         log_prob = self._log_prob_from_raw_y(raw_y)
         return torch.tanh(raw_y), log_prob
 
+    def sample_log_prob(self) -> torch.Tensor:
+        # non-reparameterized sample; squashed log-probability without
+        # materializing tanh(y)
+        raw_y = self._dist.sample()
+        return self._log_prob_from_raw_y(raw_y)
+
     def sample_without_squash(self) -> torch.Tensor:
         return self._dist.rsample()
 
@@ -36,13 +36,15 @@ def _gather_quantiles_by_indices(
     # TODO: implement this in general case
     if y.dim() == 3:
         # (N, batch, n_quantiles) -> (batch, n_quantiles)
-        return y.transpose(0, 1)[torch.arange(y.shape[1]), indices]
+        return y.transpose(0, 1)[
+            torch.arange(y.shape[1], device=y.device), indices
+        ]
     elif y.dim() == 4:
         # (N, batch, action, n_quantiles) -> (batch, action, N, n_quantiles)
         transposed_y = y.transpose(0, 1).transpose(1, 2)
         # (batch, action, N, n_quantiles) -> (batch * action, N, n_quantiles)
         flat_y = transposed_y.reshape(-1, y.shape[0], y.shape[3])
-        head_indices = torch.arange(y.shape[1] * y.shape[2])
+        head_indices = torch.arange(y.shape[1] * y.shape[2], device=y.device)
         # (batch * action, N, n_quantiles) -> (batch * action, n_quantiles)
         gathered_y = flat_y[head_indices, indices.view(-1)]
         # (batch * action, n_quantiles) -> (batch, action, n_quantiles)
@@ -85,11 +87,8 @@ def compute_ensemble_q_function_error(
     gamma: float = 0.99,
 ) -> torch.Tensor:
     assert target.ndim == 2
-    td_sum = torch.tensor(
-        0.0,
-        dtype=torch.float32,
-        device=observations.device,
-    )
+    # filled on device without a host-to-device copy
+    td_sum = torch.zeros((), dtype=torch.float32, device=observations.device)
     for forwarder in forwarders:
         loss = forwarder.compute_error(
             observations=observations,
@@ -81,7 +81,7 @@ class FQEBaseImpl(QLearningAlgoImplBase):
             rewards=batch.rewards,
             target=q_tpn,
             terminals=batch.terminals,
-            gamma=self._gamma**batch.intervals,
+            gamma=batch.compute_discounts(self._gamma),
         )
 
     def compute_target(
@@ -103,7 +103,7 @@ class FQEBaseImpl(QLearningAlgoImplBase):
 
     def inner_update(
         self, batch: TorchMiniBatch, grad_step: int
-    ) -> Dict[str, float]:
+    ) -> Dict[str, Union[float, torch.Tensor]]:
         next_actions = self._algo.predict_best_action(batch.next_observations)
 
         q_tpn = self.compute_target(batch, next_actions)
@@ -116,7 +116,7 @@ class FQEBaseImpl(QLearningAlgoImplBase):
         if grad_step % self._target_update_interval == 0:
             self.update_target()
 
-        return {"loss": float(loss.cpu().detach().numpy())}
+        return {"loss": loss.detach()}
 
 
 class FQEImpl(ContinuousQFunctionMixin, FQEBaseImpl):
@@ -135,11 +135,11 @@ class DiscreteFQEImpl(DiscreteQFunctionMixin, FQEBaseImpl):
     ) -> torch.Tensor:
         return self._q_func_forwarder.compute_error(
             observations=batch.observations,
-            actions=batch.actions.long(),
+            actions=batch.discrete_actions,
             rewards=batch.rewards,
             target=q_tpn,
             terminals=batch.terminals,
-            gamma=self._gamma**batch.intervals,
+            gamma=batch.compute_discounts(self._gamma),
         )
 
     def compute_target(
@@ -1,6 +1,15 @@
 import collections
 import dataclasses
-from typing import Any, BinaryIO, Dict, Optional, Sequence, TypeVar, Union
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+)
 
 import numpy as np
 import torch
@@ -22,6 +31,9 @@ __all__ = [
     "Modules",
     "convert_to_torch",
     "convert_to_torch_recursively",
+    "convert_metrics_to_float",
+    "convert_metrics_list_to_float",
+    "bf16_autocast",
     "eval_api",
     "train_api",
     "View",
@@ -39,10 +51,18 @@ def soft_sync(targ_model: nn.Module, model: nn.Module, tau: float) -> None:
 
 def hard_sync(targ_model: nn.Module, model: nn.Module) -> None:
     with torch.no_grad():
-        params = model.parameters()
-        targ_params = targ_model.parameters()
-        for p, p_targ in zip(params, targ_params):
-            p_targ.data.copy_(p.data)
+        pairs = list(zip(model.parameters(), targ_model.parameters()))
+        if not pairs:
+            return
+        params = [p.data for p, _ in pairs]
+        targ_params = [p_targ.data for _, p_targ in pairs]
+        if hasattr(torch, "_foreach_copy_"):
+            # single fused launch instead of one copy kernel per parameter
+            torch._foreach_copy_(targ_params, params)
+        else:
+            # torch<2.1 does not provide _foreach_copy_
+            for p, p_targ in zip(params, targ_params):
+                p_targ.copy_(p)
 
 
 def sync_optimizer_state(targ_optim: Optimizer, optim: Optimizer) -> None:
@@ -64,7 +84,8 @@ def map_location(device: str) -> Any:
 
 def convert_to_torch(array: np.ndarray, device: str) -> torch.Tensor:
     dtype = torch.uint8 if array.dtype == np.uint8 else torch.float32
-    tensor = torch.tensor(data=array, dtype=dtype, device=device)
+    # as_tensor skips the intermediate host copy torch.tensor always makes
+    tensor = torch.as_tensor(array, dtype=dtype, device=device)
     return tensor.float()
 
 
@@ -79,6 +100,45 @@ def convert_to_torch_recursively(
         raise ValueError(f"invalid array type: {type(array)}")
 
 
+def bf16_autocast(device: str, enabled: bool) -> torch.autocast:
+    # bfloat16 keeps the float32 exponent range so no GradScaler is needed
+    device_type = "cuda" if "cuda" in device else "cpu"
+    return torch.autocast(
+        device_type=device_type, dtype=torch.bfloat16, enabled=enabled
+    )
+
+
+def convert_metrics_to_float(metrics: Dict[str, Any]) -> Dict[str, float]:
+    return convert_metrics_list_to_float([metrics])[0]
+
+
+def convert_metrics_list_to_float(
+    metrics_list: Sequence[Dict[str, Any]]
+) -> List[Dict[str, float]]:
+    # transfer all tensor values at once to synchronize device only once
+    tensors = [
+        v.detach().reshape([])
+        for metrics in metrics_list
+        for v in metrics.values()
+        if isinstance(v, torch.Tensor)
+    ]
+    host_values: List[float] = []
+    if tensors:
+        host_values = torch.stack(tensors).cpu().tolist()
+    ret: List[Dict[str, float]] = []
+    cursor = 0
+    for metrics in metrics_list:
+        converted: Dict[str, float] = {}
+        for k, v in metrics.items():
+            if isinstance(v, torch.Tensor):
+                converted[k] = host_values[cursor]
+                cursor += 1
+            else:
+                converted[k] = float(v)
+        ret.append(converted)
+    return ret
+
+
 @dataclasses.dataclass(frozen=True)
 class TorchMiniBatch:
     observations: torch.Tensor
@@ -89,6 +149,26 @@ class TorchMiniBatch:
     intervals: torch.Tensor
     device: str
     numpy_batch: Optional[TransitionMiniBatch] = None
+    _discounts: Dict[float, torch.Tensor] = dataclasses.field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _discrete_actions: Optional[torch.Tensor] = dataclasses.field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def compute_discounts(self, gamma: float) -> torch.Tensor:
+        # gamma ** intervals is computed only once per mini-batch
+        if gamma not in self._discounts:
+            self._discounts[gamma] = gamma**self.intervals
+        return self._discounts[gamma]
+
+    @property
+    def discrete_actions(self) -> torch.Tensor:
+        # int64 actions are cast only once per mini-batch
+        if self._discrete_actions is None:
+            object.__setattr__(self, "_discrete_actions", self.actions.long())
+        assert self._discrete_actions is not None
+        return self._discrete_actions
 
     @classmethod
     def from_batch(
@@ -99,7 +179,8 @@ class TorchMiniBatch:
         action_scaler: Optional[ActionScaler] = None,
         reward_scaler: Optional[RewardScaler] = None,
     ) -> "TorchMiniBatch":
-        # convert numpy array to torch tensor
+        # each field is already stacked into a single contiguous array so
+        # that it is transferred to the device in one copy
         observations = convert_to_torch_recursively(batch.observations, device)
         actions = convert_to_torch(batch.actions, device)
         rewards = convert_to_torch(batch.rewards, device)
@@ -1,4 +1,4 @@
-from typing import Optional, Sequence
+from typing import Optional, Sequence, Type, Union
 
 import pytest
 
@@ -10,7 +10,7 @@ from d3rlpy.models import (
 )
 
 from ...testing_utils import create_scaler_tuple
-from .algo_test import algo_tester
+from .algo_test import algo_tester, update_tester
 
 
 @pytest.mark.parametrize("observation_shape", [(100,), (4, 84, 84)])
@@ -19,11 +19,13 @@ from .algo_test import algo_tester
     "q_func_factory", [MeanQFunctionFactory(), QRQFunctionFactory()]
 )
 @pytest.mark.parametrize("scalers", [None, "min_max"])
+@pytest.mark.parametrize("accumulation_steps", [1, 2])
 def test_dqn(
     observation_shape: Sequence[int],
     n_critics: int,
     q_func_factory: QFunctionFactory,
     scalers: Optional[str],
+    accumulation_steps: int,
 ) -> None:
     observation_scaler, _, reward_scaler = create_scaler_tuple(scalers)
     config = DQNConfig(
@@ -31,6 +33,7 @@ def test_dqn(
         q_func_factory=q_func_factory,
         observation_scaler=observation_scaler,
         reward_scaler=reward_scaler,
+        accumulation_steps=accumulation_steps,
     )
     dqn = config.create()
     algo_tester(
@@ -38,6 +41,8 @@ def test_dqn(
         observation_shape,
         test_policy_copy=False,
         test_policy_optim_copy=False,
+        # optimizer is not stepped until gradients are accumulated
+        test_q_function_optim_copy=accumulation_steps == 1,
     )
 
 
@@ -67,3 +72,23 @@ def test_double_dqn(
         test_policy_copy=False,
         test_policy_optim_copy=False,
     )
+
+
+@pytest.mark.parametrize("config_cls", [DQNConfig, DoubleDQNConfig])
+def test_dqn_use_amp(
+    config_cls: Union[Type[DQNConfig], Type[DoubleDQNConfig]]
+) -> None:
+    dqn = config_cls(use_amp=True).create()
+    update_tester(dqn, (100,), 2)  # type: ignore
+
+
+def test_dqn_cuda_graph_requires_cuda() -> None:
+    dqn = DQNConfig(use_cuda_graph=True).create()
+    with pytest.raises(ValueError):
+        dqn.create_impl((100,), 2)
+
+
+def test_dqn_cuda_graph_rejects_amp() -> None:
+    dqn = DQNConfig(use_cuda_graph=True, use_amp=True).create()
+    with pytest.raises(ValueError, match="autocast"):
+        dqn.create_impl((100,), 2)
@@ -1,4 +1,5 @@
-from typing import Optional, Sequence
+import sys
+from typing import Optional, Sequence, Type, Union
 
 import pytest
 
@@ -10,7 +11,7 @@ from d3rlpy.models import (
 )
 
 from ...testing_utils import create_scaler_tuple
-from .algo_test import algo_tester
+from .algo_test import algo_tester, update_tester
 
 
 @pytest.mark.parametrize("observation_shape", [(100,), (4, 84, 84)])
@@ -41,16 +42,50 @@ def test_sac(
     "q_func_factory", [MeanQFunctionFactory(), QRQFunctionFactory()]
 )
 @pytest.mark.parametrize("scalers", [None, "min_max"])
+@pytest.mark.parametrize("accumulation_steps", [1, 2])
 def test_discrete_sac(
     observation_shape: Sequence[int],
     q_func_factory: QFunctionFactory,
     scalers: Optional[str],
+    accumulation_steps: int,
 ) -> None:
     observation_scaler, _, reward_scaler = create_scaler_tuple(scalers)
     config = DiscreteSACConfig(
         q_func_factory=q_func_factory,
         observation_scaler=observation_scaler,
         reward_scaler=reward_scaler,
+        accumulation_steps=accumulation_steps,
     )
     sac = config.create()
-    algo_tester(sac, observation_shape, action_size=100)  # type: ignore
+    algo_tester(
+        sac,  # type: ignore
+        observation_shape,
+        action_size=100,
+        # optimizer is not stepped until gradients are accumulated
+        test_q_function_optim_copy=accumulation_steps == 1,
+    )
+
+
+@pytest.mark.skipif(
+    sys.platform == "darwin", reason="torch.compile toolchain is unavailable"
+)
+@pytest.mark.parametrize(
+    "config_cls,action_size", [(SACConfig, 2), (DiscreteSACConfig, 100)]
+)
+def test_sac_compile_target_math(
+    config_cls: Union[Type[SACConfig], Type[DiscreteSACConfig]],
+    action_size: int,
+) -> None:
+    sac = config_cls(compile_target_math=True).create()
+    update_tester(sac, (100,), action_size)  # type: ignore
+
+
+@pytest.mark.parametrize(
+    "config_cls,action_size", [(SACConfig, 2), (DiscreteSACConfig, 100)]
+)
+def test_sac_use_amp(
+    config_cls: Union[Type[SACConfig], Type[DiscreteSACConfig]],
+    action_size: int,
+) -> None:
+    sac = config_cls(use_amp=True).create()
+    update_tester(sac, (100,), action_size)  # type: ignore
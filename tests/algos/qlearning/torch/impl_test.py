@@ -0,0 +1,72 @@
+from typing import Callable, List, Sequence
+
+import torch
+from torch import nn
+
+from d3rlpy.torch_utility import TorchMiniBatch
+
+
+def create_torch_mini_batch(
+    batch_size: int,
+    observation_size: int,
+    action_size: int,
+    device: str = "cpu:0",
+) -> TorchMiniBatch:
+    actions = torch.randint(action_size, size=(batch_size, 1), device=device)
+    terminals = torch.randint(2, size=(batch_size, 1), device=device)
+    return TorchMiniBatch(
+        observations=torch.rand(batch_size, observation_size, device=device),
+        actions=actions.float(),
+        rewards=torch.rand(batch_size, 1, device=device),
+        next_observations=torch.rand(
+            batch_size, observation_size, device=device
+        ),
+        terminals=terminals.float(),
+        intervals=torch.ones(batch_size, 1, device=device),
+        device=device,
+    )
+
+
+def concat_torch_mini_batches(
+    batches: Sequence[TorchMiniBatch],
+) -> TorchMiniBatch:
+    return TorchMiniBatch(
+        observations=torch.cat([b.observations for b in batches]),
+        actions=torch.cat([b.actions for b in batches]),
+        rewards=torch.cat([b.rewards for b in batches]),
+        next_observations=torch.cat([b.next_observations for b in batches]),
+        terminals=torch.cat([b.terminals for b in batches]),
+        intervals=torch.cat([b.intervals for b in batches]),
+        device="cpu:0",
+    )
+
+
+def _clone_parameters(module: nn.Module) -> List[torch.Tensor]:
+    return [param.detach().clone() for param in module.parameters()]
+
+
+def gradient_accumulation_tester(
+    update: Callable[[TorchMiniBatch], object],
+    module: nn.Module,
+    ref_update: Callable[[TorchMiniBatch], object],
+    ref_module: nn.Module,
+    batches: Sequence[TorchMiniBatch],
+) -> None:
+    # module and ref_module must start from the same parameters
+    initial_params = _clone_parameters(module)
+
+    # optimizer steps only at every len(batches)-th call
+    for i, batch in enumerate(batches):
+        update(batch)
+        is_updated = any(
+            not torch.equal(param, init_param)
+            for param, init_param in zip(module.parameters(), initial_params)
+        )
+        assert is_updated == (i == len(batches) - 1)
+
+    # accumulated update matches a single update with the whole batch
+    ref_update(concat_torch_mini_batches(batches))
+    for param, ref_param in zip(module.parameters(), ref_module.parameters()):
+        assert param.grad is not None and ref_param.grad is not None
+        assert torch.allclose(param.grad, ref_param.grad, atol=1e-6)
+        assert torch.allclose(param, ref_param, atol=1e-6)
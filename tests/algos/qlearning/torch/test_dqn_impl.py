@@ -0,0 +1,188 @@
+import pytest
+import torch
+
+from d3rlpy.algos.qlearning.dqn import DoubleDQNConfig, DQNConfig
+from d3rlpy.algos.qlearning.torch.dqn_impl import (
+    _CUDA_GRAPH_WARMUP_STEPS,
+    DoubleDQNImpl,
+    DQNImpl,
+)
+from d3rlpy.models import (
+    MeanQFunctionFactory,
+    QFunctionFactory,
+    QRQFunctionFactory,
+    SGDFactory,
+)
+
+from .impl_test import create_torch_mini_batch, gradient_accumulation_tester
+
+
+@pytest.mark.parametrize("observation_size", [100])
+@pytest.mark.parametrize("action_size", [4])
+@pytest.mark.parametrize("batch_size", [32])
+@pytest.mark.parametrize("accumulation_steps", [2, 4])
+def test_dqn_gradient_accumulation(
+    observation_size: int,
+    action_size: int,
+    batch_size: int,
+    accumulation_steps: int,
+) -> None:
+    # SGD keeps the update proportional to the gradient
+    dqn = DQNConfig(
+        learning_rate=1e-2,
+        optim_factory=SGDFactory(),
+        accumulation_steps=accumulation_steps,
+    ).create()
+    dqn.create_impl((observation_size,), action_size)
+    impl = dqn.impl
+    assert isinstance(impl, DQNImpl)
+
+    # reference without accumulation starting from the same parameters
+    ref_dqn = DQNConfig(learning_rate=1e-2, optim_factory=SGDFactory()).create()
+    ref_dqn.create_impl((observation_size,), action_size)
+    ref_impl = ref_dqn.impl
+    assert isinstance(ref_impl, DQNImpl)
+    ref_impl._modules.q_funcs.load_state_dict(
+        impl._modules.q_funcs.state_dict()
+    )
+    ref_impl._modules.targ_q_funcs.load_state_dict(
+        impl._modules.targ_q_funcs.state_dict()
+    )
+
+    batches = [
+        create_torch_mini_batch(batch_size, observation_size, action_size)
+        for _ in range(accumulation_steps)
+    ]
+    gradient_accumulation_tester(
+        impl.update_q_func,
+        impl._modules.q_funcs,
+        ref_impl.update_q_func,
+        ref_impl._modules.q_funcs,
+        batches,
+    )
+
+
+@pytest.mark.parametrize("observation_size", [100])
+@pytest.mark.parametrize("action_size", [4])
+@pytest.mark.parametrize("batch_size", [32])
+def test_dqn_reset_gradient_accumulation(
+    observation_size: int, action_size: int, batch_size: int
+) -> None:
+    with pytest.raises(ValueError, match="accumulation_steps"):
+        DQNConfig(accumulation_steps=0).create().create_impl(
+            (observation_size,), action_size
+        )
+
+    dqn = DQNConfig(accumulation_steps=2).create()
+    dqn.create_impl((observation_size,), action_size)
+    impl = dqn.impl
+    assert isinstance(impl, DQNImpl)
+
+    batch = create_torch_mini_batch(batch_size, observation_size, action_size)
+    impl.update_q_func(batch)
+    assert impl._accum_counter == 1
+    impl.reset_optimizer_states()
+    assert impl._accum_counter == 0
+
+
+@pytest.mark.parametrize("observation_size", [100])
+@pytest.mark.parametrize("action_size", [4])
+@pytest.mark.parametrize("batch_size", [32])
+@pytest.mark.parametrize("n_critics", [2])
+@pytest.mark.parametrize(
+    "q_func_factory", [MeanQFunctionFactory(), QRQFunctionFactory()]
+)
+def test_double_dqn_compute_target(
+    observation_size: int,
+    action_size: int,
+    batch_size: int,
+    n_critics: int,
+    q_func_factory: QFunctionFactory,
+) -> None:
+    double_dqn = DoubleDQNConfig(
+        n_critics=n_critics, q_func_factory=q_func_factory
+    ).create()
+    double_dqn.create_impl((observation_size,), action_size)
+    impl = double_dqn.impl
+    assert isinstance(impl, DoubleDQNImpl)
+
+    # make target networks differ from online networks
+    with torch.no_grad():
+        for param in impl._modules.targ_q_funcs.parameters():
+            param.normal_()
+
+    batch = create_torch_mini_batch(batch_size, observation_size, action_size)
+    target = impl.compute_target(batch)
+
+    # pick actions first and then reduce over ensemble
+    with torch.no_grad():
+        action = impl.inner_predict_best_action(batch.next_observations)
+        ref_target = impl._targ_q_func_forwarder.compute_target(
+            batch.next_observations, action, reduction="min"
+        )
+
+    assert target.shape == ref_target.shape
+    assert torch.allclose(target, ref_target, atol=1e-6)
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason="requires CUDA")
+@pytest.mark.parametrize("observation_size", [100])
+@pytest.mark.parametrize("action_size", [4])
+@pytest.mark.parametrize("batch_size", [32])
+@pytest.mark.parametrize(
+    "q_func_factory", [MeanQFunctionFactory(), QRQFunctionFactory()]
+)
+@pytest.mark.parametrize("n_replays", [5])
+def test_dqn_cuda_graph(
+    observation_size: int,
+    action_size: int,
+    batch_size: int,
+    q_func_factory: QFunctionFactory,
+    n_replays: int,
+) -> None:
+    dqn = DQNConfig(
+        q_func_factory=q_func_factory, use_cuda_graph=True
+    ).create(device="cuda:0")
+    dqn.create_impl((observation_size,), action_size)
+    impl = dqn.impl
+    assert isinstance(impl, DQNImpl)
+
+    # eager reference starting from the same parameters
+    ref_dqn = DQNConfig(q_func_factory=q_func_factory).create(device="cuda:0")
+    ref_dqn.create_impl((observation_size,), action_size)
+    ref_impl = ref_dqn.impl
+    assert isinstance(ref_impl, DQNImpl)
+    ref_impl._modules.q_funcs.load_state_dict(
+        impl._modules.q_funcs.state_dict()
+    )
+    ref_impl._modules.targ_q_funcs.load_state_dict(
+        impl._modules.targ_q_funcs.state_dict()
+    )
+
+    # warmup, capture and replays
+    n_updates = _CUDA_GRAPH_WARMUP_STEPS + 1 + n_replays
+    for grad_step in range(n_updates):
+        batch = create_torch_mini_batch(
+            batch_size, observation_size, action_size, device="cuda:0"
+        )
+        metrics = impl.inner_update(batch, grad_step)
+        ref_metrics = ref_impl.inner_update(batch, grad_step)
+        assert torch.allclose(
+            metrics["loss"], ref_metrics["loss"], atol=1e-5  # type: ignore
+        )
+    assert impl._graph is not None
+
+    for param, ref_param in zip(
+        impl._modules.q_funcs.parameters(),
+        ref_impl._modules.q_funcs.parameters(),
+    ):
+        assert torch.allclose(param, ref_param, atol=1e-5)
+
+    # graph is dropped when optimizer states are replaced
+    impl.reset_optimizer_states()
+    assert impl._graph is None
+    impl.inner_update(batch, n_updates)
+
+    impl.copy_q_function_optim_from(ref_impl)
+    assert impl._graph is None
+    impl.inner_update(batch, n_updates + 1)
@@ -0,0 +1,190 @@
+import sys
+from typing import Optional
+
+import pytest
+import torch
+import torch.nn.functional as F
+
+from d3rlpy.algos.qlearning.sac import DiscreteSACConfig
+from d3rlpy.algos.qlearning.torch.sac_impl import (
+    DiscreteSACImpl,
+    _compute_discrete_actor_loss,
+    _compute_discrete_target,
+    _maybe_compile,
+    _sac_target_math,
+)
+from d3rlpy.models import SGDFactory
+
+from .impl_test import create_torch_mini_batch, gradient_accumulation_tester
+
+# torch.compile needs a working Inductor toolchain
+COMPILE_GRAPH_PARAMS = [
+    False,
+    pytest.param(
+        True,
+        marks=pytest.mark.skipif(
+            sys.platform == "darwin",
+            reason="torch.compile toolchain is unavailable",
+        ),
+    ),
+]
+
+
+def _ref_discrete_target(
+    logits: torch.Tensor, target: torch.Tensor, temp: torch.Tensor
+) -> torch.Tensor:
+    log_probs = F.log_softmax(logits, dim=1)
+    probs = log_probs.exp()
+    entropy = temp * log_probs
+    keepdims = True
+    if target.dim() == 3:
+        entropy = entropy.unsqueeze(-1)
+        probs = probs.unsqueeze(-1)
+        keepdims = False
+    return (probs * (target - entropy)).sum(dim=1, keepdim=keepdims)
+
+
+def _ref_discrete_actor_loss(
+    logits: torch.Tensor, q_t: torch.Tensor, temp: torch.Tensor
+) -> torch.Tensor:
+    log_probs = F.log_softmax(logits, dim=1)
+    probs = log_probs.exp()
+    entropy = temp * log_probs
+    return (probs * (entropy - q_t)).sum(dim=1).mean()
+
+
+@pytest.mark.parametrize("batch_size", [32])
+@pytest.mark.parametrize("action_size", [4])
+@pytest.mark.parametrize("n_quantiles", [None, 8])
+@pytest.mark.parametrize("compile_graph", COMPILE_GRAPH_PARAMS)
+def test_compute_discrete_target(
+    batch_size: int,
+    action_size: int,
+    n_quantiles: Optional[int],
+    compile_graph: bool,
+) -> None:
+    logits = torch.rand(batch_size, action_size)
+    if n_quantiles is None:
+        target = torch.rand(batch_size, action_size)
+    else:
+        target = torch.rand(batch_size, action_size, n_quantiles)
+    temp = torch.rand(1, 1)
+
+    func = _maybe_compile(_compute_discrete_target, compile_graph)
+    value = func(F.log_softmax(logits, dim=1), target, temp)
+
+    ref_value = _ref_discrete_target(logits, target, temp)
+    if n_quantiles is None:
+        assert value.shape == (batch_size, 1)
+    else:
+        assert value.shape == (batch_size, n_quantiles)
+    assert torch.allclose(value, ref_value, atol=1e-6)
+
+
+@pytest.mark.parametrize("batch_size", [32])
+@pytest.mark.parametrize("action_size", [4])
+@pytest.mark.parametrize("compile_graph", COMPILE_GRAPH_PARAMS)
+def test_compute_discrete_actor_loss(
+    batch_size: int, action_size: int, compile_graph: bool
+) -> None:
+    logits = torch.rand(batch_size, action_size, requires_grad=True)
+    q_t = torch.rand(batch_size, action_size)
+    temp = torch.rand(1, 1)
+
+    func = _maybe_compile(_compute_discrete_actor_loss, compile_graph)
+    loss = func(F.log_softmax(logits, dim=1), q_t, temp)
+    (grad,) = torch.autograd.grad(loss, logits)
+
+    ref_loss = _ref_discrete_actor_loss(logits, q_t, temp)
+    (ref_grad,) = torch.autograd.grad(ref_loss, logits)
+
+    assert loss.shape == ()
+    assert torch.allclose(loss, ref_loss, atol=1e-6)
+    assert torch.allclose(grad, ref_grad, atol=1e-6)
+
+
+@pytest.mark.parametrize("batch_size", [32])
+@pytest.mark.parametrize("compile_graph", COMPILE_GRAPH_PARAMS)
+def test_sac_target_math(batch_size: int, compile_graph: bool) -> None:
+    target = torch.rand(batch_size, 1)
+    log_prob = torch.rand(batch_size, 1)
+    temp = torch.rand(1, 1)
+
+    func = _maybe_compile(_sac_target_math, compile_graph)
+    value = func(target, log_prob, temp)
+
+    assert value.shape == (batch_size, 1)
+    assert torch.allclose(value, target - temp * log_prob, atol=1e-6)
+
+
+@pytest.mark.parametrize("observation_size", [100])
+@pytest.mark.parametrize("action_size", [4])
+@pytest.mark.parametrize("batch_size", [32])
+@pytest.mark.parametrize("accumulation_steps", [2, 4])
+def test_discrete_sac_gradient_accumulation(
+    observation_size: int,
+    action_size: int,
+    batch_size: int,
+    accumulation_steps: int,
+) -> None:
+    # SGD keeps the update proportional to the gradient
+    sac = DiscreteSACConfig(
+        critic_learning_rate=1e-2,
+        critic_optim_factory=SGDFactory(),
+        accumulation_steps=accumulation_steps,
+    ).create()
+    sac.create_impl((observation_size,), action_size)
+    impl = sac.impl
+    assert isinstance(impl, DiscreteSACImpl)
+
+    # reference without accumulation starting from the same parameters
+    ref_sac = DiscreteSACConfig(
+        critic_learning_rate=1e-2, critic_optim_factory=SGDFactory()
+    ).create()
+    ref_sac.create_impl((observation_size,), action_size)
+    ref_impl = ref_sac.impl
+    assert isinstance(ref_impl, DiscreteSACImpl)
+    ref_impl._modules.policy.load_state_dict(
+        impl._modules.policy.state_dict()
+    )
+    ref_impl._modules.q_funcs.load_state_dict(
+        impl._modules.q_funcs.state_dict()
+    )
+    ref_impl._modules.targ_q_funcs.load_state_dict(
+        impl._modules.targ_q_funcs.state_dict()
+    )
+
+    batches = [
+        create_torch_mini_batch(batch_size, observation_size, action_size)
+        for _ in range(accumulation_steps)
+    ]
+    gradient_accumulation_tester(
+        impl.update_critic,
+        impl._modules.q_funcs,
+        ref_impl.update_critic,
+        ref_impl._modules.q_funcs,
+        batches,
+    )
+
+
+@pytest.mark.parametrize("observation_size", [100])
+@pytest.mark.parametrize("action_size", [4])
+@pytest.mark.parametrize("batch_size", [32])
+def test_discrete_sac_reset_gradient_accumulation(
+    observation_size: int, action_size: int, batch_size: int
+) -> None:
+    with pytest.raises(ValueError, match="accumulation_steps"):
+        DiscreteSACConfig(accumulation_steps=0).create().create_impl(
+            (observation_size,), action_size
+        )
+
+    sac = DiscreteSACConfig(accumulation_steps=2).create()
+    sac.create_impl((observation_size,), action_size)
+    impl = sac.impl
+    assert isinstance(impl, DiscreteSACImpl)
+
+    batch = create_torch_mini_batch(batch_size, observation_size, action_size)
+    impl.update_critic(batch)
+    assert impl._accum_counter == 1
+    impl.reset_optimizer_states()
+    assert impl._accum_counter == 0
@@ -102,3 +102,11 @@ def test_squashed_gaussian_distribution(
 
     assert torch.all(dist.mean == torch.tanh(mean))
     assert torch.all(dist.std == std)
+
+    torch.manual_seed(0)
+    y = torch.tanh(ref_dist.sample())
+    torch.manual_seed(0)
+    log_prob = dist.sample_log_prob()
+    ref_log_prob = _ref_squashed_log_prob(ref_dist, y)
+    assert log_prob.shape == (batch_size, 1)
+    assert torch.allclose(log_prob, ref_log_prob, atol=0.5)
@@ -2,7 +2,11 @@ import dataclasses
 
 import torch
 
-from d3rlpy.dataclass_utils import asdict_as_float, asdict_without_copy
+from d3rlpy.dataclass_utils import (
+    asdict_as_float,
+    asdict_detached,
+    asdict_without_copy,
+)
 
 
 @dataclasses.dataclass(frozen=True)
@@ -38,3 +42,13 @@ def test_asdict_as_float() -> None:
     dict_d = asdict_as_float(d)
     assert dict_d["a"] == 1.0
     assert dict_d["b"] == b.numpy()
+
+
+def test_asdict_detached() -> None:
+    b = torch.rand([], dtype=torch.float32, requires_grad=True)
+    d = D2(a=1.0, b=b * 2)
+    dict_d = asdict_detached(d)
+    assert dict_d["a"] == 1.0
+    assert isinstance(dict_d["b"], torch.Tensor)
+    assert not dict_d["b"].requires_grad
+    assert torch.allclose(dict_d["b"], b * 2)
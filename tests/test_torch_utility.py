@@ -16,6 +16,9 @@ from d3rlpy.torch_utility import (
     TorchMiniBatch,
     TorchTrajectoryMiniBatch,
     View,
+    bf16_autocast,
+    convert_metrics_list_to_float,
+    convert_metrics_to_float,
     eval_api,
     hard_sync,
     map_location,
@@ -51,14 +54,32 @@ def test_soft_sync(tau: float, input_size: int, output_size: int) -> None:
 
 @pytest.mark.parametrize("input_size", [32])
 @pytest.mark.parametrize("output_size", [32])
-def test_hard_sync(input_size: int, output_size: int) -> None:
+@pytest.mark.parametrize("has_foreach_copy", [False, True])
+def test_hard_sync(
+    input_size: int,
+    output_size: int,
+    has_foreach_copy: bool,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
     module = torch.nn.Linear(input_size, output_size)
     targ_module = torch.nn.Linear(input_size, output_size)
 
+    # exercise both fused and per-parameter copies regardless of torch version
+    foreach_copy = Mock(
+        side_effect=lambda dsts, srcs: [d.copy_(s) for d, s in zip(dsts, srcs)]
+    )
+    if has_foreach_copy:
+        monkeypatch.setattr(
+            torch, "_foreach_copy_", foreach_copy, raising=False
+        )
+    else:
+        monkeypatch.delattr(torch, "_foreach_copy_", raising=False)
+
     hard_sync(targ_module, module)
 
+    assert foreach_copy.called == has_foreach_copy
     for p, targ_p in zip(module.parameters(), targ_module.parameters()):
-        assert torch.allclose(targ_p, p)
+        assert torch.equal(targ_p, p)
 
 
 @pytest.mark.parametrize("input_size", [32])
@@ -153,6 +174,46 @@ def test_reset_optimizer_states() -> None:
     assert not reset_state
 
 
+def test_convert_metrics_to_float() -> None:
+    a = torch.rand([], requires_grad=True)
+    b = torch.rand(1, 1)
+    metrics = convert_metrics_to_float({"a": a * 2, "b": b, "c": 3})
+    assert list(metrics.keys()) == ["a", "b", "c"]
+    for value in metrics.values():
+        assert isinstance(value, float)
+    assert np.allclose(metrics["a"], a.detach().numpy() * 2)
+    assert np.allclose(metrics["b"], b.numpy()[0][0])
+    assert metrics["c"] == 3.0
+
+
+@pytest.mark.parametrize("enabled", [False, True])
+def test_bf16_autocast(enabled: bool) -> None:
+    fc = torch.nn.Linear(10, 10)
+    with bf16_autocast("cpu:0", enabled):
+        y = fc(torch.rand(2, 10))
+    assert y.dtype == (torch.bfloat16 if enabled else torch.float32)
+
+
+def test_convert_metrics_list_to_float() -> None:
+    a = torch.rand([], requires_grad=True)
+    b = torch.rand(1, 1)
+    c = torch.rand([])
+    metrics_list = convert_metrics_list_to_float(
+        [{"a": a * 2, "b": b}, {"c": 3, "a": c}]
+    )
+    assert len(metrics_list) == 2
+    assert list(metrics_list[0].keys()) == ["a", "b"]
+    assert list(metrics_list[1].keys()) == ["c", "a"]
+    for metrics in metrics_list:
+        for value in metrics.values():
+            assert isinstance(value, float)
+    assert np.allclose(metrics_list[0]["a"], a.detach().numpy() * 2)
+    assert np.allclose(metrics_list[0]["b"], b.numpy()[0][0])
+    assert metrics_list[1]["c"] == 3.0
+    assert np.allclose(metrics_list[1]["a"], c.numpy())
+    assert convert_metrics_list_to_float([]) == []
+
+
 @pytest.mark.skip(reason="no way to test this")
 def test_to_cuda() -> None:
     pass
@@ -273,6 +334,16 @@ def test_torch_mini_batch(
     assert np.all(torch_batch.terminals.numpy() == batch.terminals)
     assert np.all(torch_batch.intervals.numpy() == batch.intervals)
 
+    # check discounts
+    discounts = torch_batch.compute_discounts(0.99)
+    assert np.allclose(discounts.numpy(), 0.99**batch.intervals)
+    assert torch_batch.compute_discounts(0.99) is discounts
+
+    # check discrete actions
+    discrete_actions = torch_batch.discrete_actions
+    assert discrete_actions.dtype == torch.int64
+    assert torch_batch.discrete_actions is discrete_actions
+
 
 @pytest.mark.parametrize("batch_size", [32])
 @pytest.mark.parametrize("length", [32])